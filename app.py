@@ -16,31 +16,32 @@
 
 from __future__ import annotations
 
-import json
 import time
+
+_T_INICIO_IMPORT = time.perf_counter()
+
+import json
+import os
 import re
 import unicodedata
-from datetime import datetime
+from collections import deque
+from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.edge.options import Options
-from selenium.webdriver.edge.service import Service
+# Selenium se importa recién al crear el primer driver (ver _cargar_selenium):
+# servir un snapshot no lo necesita y el import pesa en cada cold start.
+webdriver = By = WebDriverWait = EC = Options = Service = None
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, redirect, send_from_directory, abort
 from flask_cors import CORS
 
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+import bloqueo
+import historial
+import logos
+import salud_links
+
 import threading
-import time
-import json
-from pathlib import Path
-from datetime import datetime
 
 app = Flask(__name__)
 CORS(app)
@@ -62,6 +63,7 @@ SALIDA_PARTIDOS_HOY = Path("partidos.json")
 SALIDA_PARTIDOS_AYER = Path("partidos_ayer.json")
 SALIDA_PARTIDOS_MAN = Path("partidos_man.json")
 SALIDA_CANALES = Path("canales.json")
+SALIDA_EVENTOS = Path("eventos.json")
 
 # Añadir estas constantes al inicio del archivo, en la sección de configuración
 SALIDA_DETALLES_HOY = Path("detalles_partidos_hoy.json")
@@ -111,6 +113,38 @@ PROMEDIOSINFO_LIGAS = [
 
 SALIDA_TABLAS_POSICIONES = Path("tablas_posiciones.json")
 
+# Espera de carga por tipo de página ---------------------------
+# requeridos: selectores que tienen que existir todos (una entrada con comas
+#             acepta cualquiera de sus alternativas)
+# quieto_ms:  el DOM tiene que estar sin cambios este tiempo para darla por lista
+# parcial_ms: si falta algún requerido pero hay al menos uno, la página cargó
+#             (readyState complete) y el DOM está quieto este tiempo, seguimos
+# TOPE_QUIETO_MS: páginas que nunca quedan quietas (relojes, tickers en vivo)
+#             se dan por listas igual tras este tiempo con los requeridos
+#             presentes (o por parciales tras parcial_ms + este tiempo)
+ESPERAS_PAGINA = {
+    "partidos": {"requeridos": [f"[class*='{CLS_ENCAB_LIGA}']"], "quieto_ms": 300, "parcial_ms": 1500},
+    "detalle": {
+        "requeridos": [".events-items", ".content-block", ".team-lineups"],
+        "quieto_ms": 250,
+        "parcial_ms": 1200,  # p. ej. partidos sin alineaciones confirmadas
+    },
+    "tablas": {"requeridos": [".table.is-fullwidth.tablePos.mb-5, #points"], "quieto_ms": 250, "parcial_ms": 1500},
+    "eventos": {"requeridos": [".event-name"], "quieto_ms": 250, "parcial_ms": 1500},
+    "canales": {"requeridos": ["div[data-canal]"], "quieto_ms": 250, "parcial_ms": 1500},
+}
+TOPE_QUIETO_MS = 1500
+MUESTRAS_TIEMPO_LISTO = 200  # últimas mediciones guardadas por tipo de página
+
+# Arranque en frío ---------------------------------------------
+# Con SOLO_SERVIR=1 los endpoints nunca scrapean: devuelven el último
+# snapshot bueno, precargado en memoria al iniciar. Es opt-in (también en
+# Vercel): solo tiene sentido si el deploy incluye snapshots/ o un disco
+# persistido donde otro proceso deja los .json; sin ellos respondería 503.
+MODO_SOLO_SERVIR = os.environ.get("SOLO_SERVIR", "0") == "1"
+# Snapshots empaquetados con el deploy, usados si no hay archivo persistido
+DIR_SNAPSHOTS = Path(os.environ.get("DIR_SNAPSHOTS", Path(__file__).resolve().parent / "snapshots"))
+
 # Mapping slug → Path para iterar fácilmente ------------------
 DIAS = {
     "": ("hoy", SALIDA_PARTIDOS_HOY),  # ruta vacía = hoy
@@ -130,8 +164,118 @@ def timestamp_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
+def _cargar_selenium() -> None:
+    """Importa Selenium una sola vez, la primera vez que se va a scrapear."""
+    global webdriver, By, WebDriverWait, EC, Options, Service
+    if webdriver is not None:
+        return
+    t0 = time.perf_counter()
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By as _By
+    from selenium.webdriver.support.ui import WebDriverWait as _WebDriverWait
+    from selenium.webdriver.support import expected_conditions as _EC
+    from selenium.webdriver.edge.options import Options as _Options
+    from selenium.webdriver.edge.service import Service as _Service
+
+    By, WebDriverWait, EC = _By, _WebDriverWait, _EC
+    Options, Service = _Options, _Service
+    webdriver = _webdriver
+    log(f"Selenium importado en {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+
+# Se inyecta en la página: resuelve apenas están todos los requeridos y el DOM
+# dejó de mutar, sin polling desde Python.
+JS_ESPERA_PAGINA = r"""
+const [requeridos, quietoMs, parcialMs, topeMs, timeoutMs, done] = arguments;
+const t0 = performance.now();
+let ultimoCambio = t0, timer = null, fin = false, todosDesde = null, algunoDesde = null;
+const presentes = () => requeridos.map(s => document.querySelector(s) !== null);
+const obs = new MutationObserver(() => { ultimoCambio = performance.now(); if (timer === null) programar(quietoMs); });
+const tLimite = setTimeout(() => terminar(presentes().some(Boolean) ? "parcial" : "timeout"), timeoutMs);
+function terminar(estado) {
+  if (fin) return;
+  fin = true;
+  obs.disconnect(); clearTimeout(timer); clearTimeout(tLimite);
+  done({estado: estado, ms: performance.now() - t0, presentes: presentes()});
+}
+// Las mutaciones no reinician el timer pendiente: un DOM que cambia sin
+// parar (relojes, tickers) no puede postergar la evaluación para siempre.
+function programar(ms) { clearTimeout(timer); timer = setTimeout(() => { timer = null; evaluar(); }, Math.max(ms, 20)); }
+function evaluar() {
+  const ahora = performance.now(), p = presentes(), quieto = ahora - ultimoCambio;
+  const todos = p.every(Boolean), alguno = p.some(Boolean) && document.readyState === "complete";
+  todosDesde = todos ? (todosDesde === null ? ahora : todosDesde) : null;
+  algunoDesde = alguno ? (algunoDesde === null ? ahora : algunoDesde) : null;
+  if (todos && (quieto >= quietoMs || ahora - todosDesde >= topeMs)) return terminar("listo");
+  if (alguno && !todos && (quieto >= parcialMs || ahora - algunoDesde >= parcialMs + topeMs)) return terminar("parcial");
+  if (todos) return programar(Math.min(quietoMs - quieto, topeMs - (ahora - todosDesde)));
+  if (alguno) return programar(Math.min(parcialMs - quieto, parcialMs + topeMs - (ahora - algunoDesde)));
+  programar(quietoMs);
+}
+obs.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+programar(quietoMs);
+"""
+
+# tipo de página → últimas (ms, estado) medidas
+TIEMPOS_LISTO: Dict[str, deque] = {tipo: deque(maxlen=MUESTRAS_TIEMPO_LISTO) for tipo in ESPERAS_PAGINA}
+
+
+def esperar_pagina(driver: webdriver.Edge, tipo: str) -> str:
+    """
+    Espera a que la página esté lista según ESPERAS_PAGINA[tipo] usando un
+    MutationObserver inyectado. Devuelve el estado ("listo", "parcial" o
+    "polling" si hubo que caer a WebDriverWait) y registra el tiempo.
+    Lanza TimeoutError si no apareció ningún requerido.
+    """
+    spec = ESPERAS_PAGINA[tipo]
+    t0 = time.perf_counter()
+    try:
+        resultado = driver.execute_async_script(
+            JS_ESPERA_PAGINA, spec["requeridos"], spec["quieto_ms"], spec["parcial_ms"], TOPE_QUIETO_MS,
+            TIEMPO_ESPERA * 1000,
+        )
+        estado = resultado["estado"]
+    except Exception as e:
+        log(f"Espera por MutationObserver falló ({tipo}): {e}; usando WebDriverWait")
+        WebDriverWait(driver, TIEMPO_ESPERA).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(spec["requeridos"])))
+        )
+        estado = "polling"
+
+    ms = (time.perf_counter() - t0) * 1000
+    TIEMPOS_LISTO[tipo].append((ms, estado))
+    if estado == "timeout":
+        raise TimeoutError(f"Página {tipo} sin {spec['requeridos']} tras {TIEMPO_ESPERA} s")
+    if estado != "listo":
+        log(f"Página {tipo} {estado} en {ms:.0f} ms")
+    return estado
+
+
+def resumen_tiempos_listo() -> Dict[str, Any]:
+    """Resumen por tipo de página para ajustar quieto_ms / parcial_ms / TIEMPO_ESPERA."""
+    resumen = {}
+    for tipo, muestras in TIEMPOS_LISTO.items():
+        # Copia primero: los hilos de scraping agregan muestras mientras tanto
+        muestras = list(muestras)
+        if not muestras:
+            continue
+        tiempos = sorted(ms for ms, _ in muestras)
+        estados: Dict[str, int] = {}
+        for _, estado in muestras:
+            estados[estado] = estados.get(estado, 0) + 1
+        resumen[tipo] = {
+            "muestras": len(tiempos),
+            "p50_ms": round(tiempos[len(tiempos) // 2]),
+            "p95_ms": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]),
+            "max_ms": round(tiempos[-1]),
+            "estados": estados,
+        }
+    return resumen
+
+
 def crear_driver() -> webdriver.Edge:
     """Inicializa WebDriver Edge/Chrome en modo headless/new."""
+    _cargar_selenium()
     opts = Options()
     if HEADLESS:
         opts.add_argument("--headless=new")
@@ -143,7 +287,9 @@ def crear_driver() -> webdriver.Edge:
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/123.0.0.0 Safari/537.36"
     )
-    return webdriver.Edge(service=Service(PATH_DRIVER), options=opts)
+    driver = webdriver.Edge(service=Service(PATH_DRIVER), options=opts)
+    driver.set_script_timeout(TIEMPO_ESPERA + 5)  # margen sobre el límite de esperar_pagina
+    return driver
 
 
 def slug(txt: str) -> str:
@@ -185,9 +331,7 @@ def scrapear_tablas_posiciones() -> None:
             log(f"Visitando {url}...")
             try:
                 driver.get(url)
-                WebDriverWait(driver, TIEMPO_ESPERA).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".table.is-fullwidth.tablePos.mb-5, #points"))
-                )
+                esperar_pagina(driver, "tablas")
                 
                 if "liga/" in liga:
                     # Buscar exactamente las dos primeras tablas de posiciones (no más)
@@ -310,16 +454,89 @@ def scrapear_tablas_posiciones() -> None:
 
 # ───────────────────── Guardar eventos en JSON separado ─────────────────────
 
-def guardar_eventos(eventos_dict: Dict[str, str]) -> None:
-    """Guarda el mapping de eventos en un JSON separado."""
+# Serializa escrituras de canales/eventos entre scrapers y el verificador de
+# links, también entre workers de gunicorn (lock de archivo)
+ARCHIVO_LOCK_STREAMS = Path("streams.lock")
+
+
+def _escribir_eventos(eventos_dict: Dict[str, str], timestamp: str | None) -> None:
+    """Escribe eventos.json con la salud de cada link. Llamar con el lock de streams tomado."""
     datos = {
-        "timestamp": timestamp_iso(),
+        "timestamp": timestamp or timestamp_iso(),
         "eventos": eventos_dict,
+        "salud": salud_links.anotar_eventos(eventos_dict),
     }
-    Path("eventos.json").write_text(
-        json.dumps(datos, indent=2, ensure_ascii=False), encoding="utf-8"
+    SALIDA_EVENTOS.write_text(json.dumps(datos, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _escribir_canales(canales: List[Dict[str, Any]], timestamp: str | None) -> None:
+    """Escribe canales.json anotando cada link. Llamar con el lock de streams tomado."""
+    salud_links.anotar_canales(canales)
+    SALIDA_CANALES.write_text(
+        json.dumps({"timestamp": timestamp or timestamp_iso(), "canales": canales}, indent=2, ensure_ascii=False),
+        encoding="utf-8",
     )
-    log("eventos.json escrito correctamente")
+
+
+def guardar_eventos(eventos_dict: Dict[str, str], timestamp: str | None = None) -> None:
+    """Guarda el mapping de eventos en un JSON separado (con la salud de cada link)."""
+    with bloqueo.bloqueo_exclusivo(ARCHIVO_LOCK_STREAMS):
+        _escribir_eventos(eventos_dict, timestamp)
+    log(f"{SALIDA_EVENTOS} escrito correctamente")
+
+
+def guardar_canales(canales: List[Dict[str, Any]], timestamp: str | None = None) -> None:
+    """Guarda la lista de canales anotando alive / latency_ms / checked_at."""
+    with bloqueo.bloqueo_exclusivo(ARCHIVO_LOCK_STREAMS):
+        _escribir_canales(canales, timestamp)
+    log(f"{SALIDA_CANALES} escrito (canales={len(canales)})")
+
+
+def links_streams() -> Tuple[List[str], bool]:
+    """
+    Todos los links publicados hoy en canales.json y eventos.json, y si se
+    pudieron leer los dos (si no, la lista está incompleta: falta un scrapeo
+    o un archivo está a medio escribir).
+    """
+    links: List[str] = []
+    completos = True
+    try:
+        links += [c["link"] for c in json.loads(SALIDA_CANALES.read_text(encoding="utf-8"))["canales"] if c.get("link")]
+    except Exception:
+        completos = False
+    try:
+        links += list(json.loads(SALIDA_EVENTOS.read_text(encoding="utf-8"))["eventos"].values())
+    except Exception:
+        completos = False
+    return links, completos
+
+
+def reanotar_streams() -> None:
+    """
+    Vuelve a escribir canales/eventos con la salud actual (conserva el
+    timestamp del scrapeo). Lee y escribe con el lock tomado, así un scrapeo
+    que termina en el medio no queda pisado por los datos viejos.
+    """
+    with bloqueo.bloqueo_exclusivo(ARCHIVO_LOCK_STREAMS):
+        try:
+            datos = json.loads(SALIDA_CANALES.read_text(encoding="utf-8"))
+            _escribir_canales(datos["canales"], datos.get("timestamp"))
+        except Exception:
+            pass
+        try:
+            datos = json.loads(SALIDA_EVENTOS.read_text(encoding="utf-8"))
+            _escribir_eventos(datos["eventos"], datos.get("timestamp"))
+        except Exception:
+            pass
+
+
+def iniciar_salud_links() -> None:
+    """
+    Arranca el verificador de links desde el camino de scraping (nunca al
+    importar la app). salud_links.iniciar elige un único proceso líder.
+    """
+    if os.environ.get("SALUD_LINKS", "1") == "1":
+        salud_links.iniciar(links_streams, reanotar_streams)
 
 # ───────────────────── Scraping La14HD / eventos ────────────────────────────
 
@@ -328,9 +545,7 @@ def scrapear_eventos() -> None:
     log("Visitando la14hd.com/eventos/ ...")
     driver.get(URL_EVENTOS)
 
-    WebDriverWait(driver, TIEMPO_ESPERA).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, ".event-name"))
-    )
+    esperar_pagina(driver, "eventos")
 
     mapping: Dict[str, str] = {}
     eventos = driver.find_elements(By.CSS_SELECTOR, ".event")
@@ -346,6 +561,7 @@ def scrapear_eventos() -> None:
     driver.quit()
     log(f"Streams capturados en eventos: {len(mapping)}")
     guardar_eventos(mapping)  # ✅ Asegurate que esto esté así
+    iniciar_salud_links()
 
 
 
@@ -366,9 +582,8 @@ def scrapear_detalles_partido(url: str, driver: webdriver.Edge) -> Dict[str, Any
         log(f"Visitando detalles del partido: {url}")
         driver.get(url)
         
-        # Esperar a que cargue la página
-        WebDriverWait(driver, TIEMPO_ESPERA).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".events-items, .content-block, .team-lineups")))
+        # Esperar a que carguen (y se estabilicen) las secciones de la página
+        esperar_pagina(driver, "detalle")
         
         # 1. Scrapear eventos del calendario
         try:
@@ -488,6 +703,8 @@ def scrapear_detalles_partidos(dia_path: str, salida_path: Path) -> None:
     
     salida_path.write_text(json.dumps(datos, indent=2, ensure_ascii=False), encoding="utf-8")
     log(f"{salida_path} actualizado (partidos con detalles: {len(detalles_partidos)})")
+    if dia_path == "ayer":
+        archivar_dia_terminado()
 
 # ───────────────────── Scraping Promiedos (genérico) ────────────────────────
 
@@ -501,10 +718,8 @@ def scrapear_partidos(dia_path: str, salida_path: Path) -> None:
     driver = crear_driver()
     driver.get(url)
 
-    # Esperamos a que cargue al menos un header de partido
-    WebDriverWait(driver, TIEMPO_ESPERA).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, f"[class*='{CLS_ENCAB_LIGA}']"))
-    )
+    # Esperamos a que carguen los headers de partido y el listado deje de cambiar
+    esperar_pagina(driver, "partidos")
 
     main = driver.find_element(By.TAG_NAME, "main")
     nodos = main.find_elements(By.CSS_SELECTOR, "*")
@@ -545,9 +760,9 @@ def scrapear_partidos(dia_path: str, salida_path: Path) -> None:
             equipo1, equipo2 = (e.text.strip() for e in equipos)
 
             # 2.2 Logos -----------------------------------------------------
-            logos = nodo.find_elements(By.CSS_SELECTOR, f"div.{CLS_LOGO} img.team")
-            logo1 = logos[0].get_attribute("src") if len(logos) >= 1 else None
-            logo2 = logos[1].get_attribute("src") if len(logos) >= 2 else None
+            imgs_logos = nodo.find_elements(By.CSS_SELECTOR, f"div.{CLS_LOGO} img.team")
+            logo1 = imgs_logos[0].get_attribute("src") if len(imgs_logos) >= 1 else None
+            logo2 = imgs_logos[1].get_attribute("src") if len(imgs_logos) >= 2 else None
 
             # 2.3 Minuto / estado ------------------------------------------
             minuto = None
@@ -615,10 +830,15 @@ def scrapear_partidos(dia_path: str, salida_path: Path) -> None:
 
     driver.quit()
 
+    # Escudos: ruta local si ya están en caché (el resto se descarga en 2º plano)
+    logos.anotar_partidos(ligas)
+
     # Serializamos a JSON ------------------------------------------------------
     datos = {"timestamp": timestamp_iso(), "ligas": ligas}
     salida_path.write_text(json.dumps(datos, indent=2, ensure_ascii=False), encoding="utf-8")
     log(f"{salida_path} actualizado (ligas: {len(ligas)})")
+    if dia_path == "ayer":
+        archivar_dia_terminado()
 
 # ───────────────────── Scraping Canales base (La14HD) ───────────────────────
 
@@ -627,9 +847,7 @@ def scrapear_canales() -> None:
     log("Visitando la14hd.com (canales) ...")
     driver.get(URL_LA14HD)
 
-    WebDriverWait(driver, TIEMPO_ESPERA).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-canal]"))
-    )
+    esperar_pagina(driver, "canales")
 
     canales: List[Dict[str, str]] = []
     for div in driver.find_elements(By.CSS_SELECTOR, "div[data-canal]"):
@@ -641,11 +859,8 @@ def scrapear_canales() -> None:
             continue
 
     driver.quit()
-    SALIDA_CANALES.write_text(
-        json.dumps({"timestamp": timestamp_iso(), "canales": canales}, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
-    log(f"{SALIDA_CANALES} escrito (canales={len(canales)})")
+    guardar_canales(canales)
+    iniciar_salud_links()
 
 # ───────────────────────────── Loop principal ───────────────────────────────
 
@@ -655,8 +870,8 @@ def necesita_actualizar_dia(salida_path: Path, dia_path: str) -> bool:
         return True
     
     try:
-        datos = json.loads(salida_path.read_text(encoding="utf-8"))
-        fecha_actualizacion = datetime.fromisoformat(datos["timestamp"])
+        # El snapshot en memoria ya tiene el timestamp: no re-parseamos el archivo
+        fecha_actualizacion = datetime.fromisoformat(timestamp_snapshot(salida_path))
         
         # Para hoy, actualizar siempre
         if dia_path == "":
@@ -667,6 +882,30 @@ def necesita_actualizar_dia(salida_path: Path, dia_path: str) -> bool:
     except Exception:
         return True
 
+def archivar_dia_terminado() -> None:
+    """
+    Agrega el snapshot de AYER (partidos + detalles) al historial comprimido.
+    Se llama después de cada actualización de partidos_ayer / detalles_ayer.
+    """
+    if not SALIDA_PARTIDOS_AYER.exists():
+        return
+    try:
+        partidos = json.loads(SALIDA_PARTIDOS_AYER.read_text(encoding="utf-8"))
+        # «ayer» es relativo al momento del scrapeo, no a la fecha actual
+        scrapeado = datetime.fromisoformat(partidos["timestamp"]).date()
+        fecha = scrapeado - timedelta(days=1)
+        detalles = None
+        if SALIDA_DETALLES_AYER.exists():
+            detalles = json.loads(SALIDA_DETALLES_AYER.read_text(encoding="utf-8"))
+            # Detalles de otro día de scrapeo son de otra fecha: no se mezclan
+            if datetime.fromisoformat(detalles["timestamp"]).date() != scrapeado:
+                detalles = None
+        escritos = historial.archivar_dia(fecha, partidos, detalles)
+        if escritos:
+            log(f"Historial: {fecha.isoformat()} archivado (partidos={escritos})")
+    except Exception as e:
+        log(f"Error al archivar día terminado: {e}")
+
 def iteracion_frecuente() -> None:
     """Ejecuta una iteración completa para HOY, AYER y MAÑANA."""
     # Siempre actualiza hoy
@@ -697,82 +936,258 @@ def iteracion_infrecuente() -> None:
 
 
 
+# ───────────────────── Snapshots en memoria (arranque en frío) ──────────────
+
+# nombre de archivo → (mtime del archivo o -1 si vino empaquetado, timestamp, JSON compacto)
+_SNAPSHOTS: Dict[str, Tuple[float, str | None, bytes]] = {}
+_refrescos_en_curso: set = set()
+_lock_refrescos = threading.Lock()
+
+ARCHIVOS_SNAPSHOT = [
+    *(salida for _, salida in DIAS.values()),
+    *(salida for _, salida in DIAS_DETALLES.values()),
+    SALIDA_TABLAS_POSICIONES,
+    SALIDA_CANALES,
+    SALIDA_EVENTOS,
+]
+
+
+def _cargar_snapshot(mtime: float, contenido: bytes) -> Tuple[float, str | None, bytes]:
+    """
+    Re-serializa el JSON sin indentación y se queda con su timestamp: se hace
+    una vez por cambio de archivo. Solo se retienen los bytes de respuesta.
+    """
+    datos = json.loads(contenido)
+    timestamp = datos.get("timestamp") if isinstance(datos, dict) else None
+    return mtime, timestamp, json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _entrada_snapshot(ruta: Path) -> Tuple[float, str | None, bytes] | None:
+    """
+    Entrada en memoria de un archivo de salida. Solo relee el disco si el
+    archivo cambió; si no existe, usa el último snapshot bueno que haya en
+    memoria (persistido o empaquetado).
+    """
+    cacheado = _SNAPSHOTS.get(ruta.name)
+    try:
+        mtime = ruta.stat().st_mtime
+    except OSError:
+        return cacheado
+    if cacheado and cacheado[0] == mtime:
+        return cacheado
+    try:
+        _SNAPSHOTS[ruta.name] = _cargar_snapshot(mtime, ruta.read_bytes())
+    except Exception as e:
+        # Archivo a medio escribir o corrupto: seguimos con el último bueno
+        log(f"Snapshot {ruta} ilegible: {e}")
+        return cacheado
+    return _SNAPSHOTS[ruta.name]
+
+
+def obtener_snapshot(ruta: Path) -> bytes | None:
+    """Bytes JSON listos para responder del snapshot de `ruta`, o None."""
+    entrada = _entrada_snapshot(ruta)
+    return entrada[2] if entrada else None
+
+
+def timestamp_snapshot(ruta: Path) -> str | None:
+    """Timestamp del snapshot de `ruta` (sin re-parsear el archivo), o None."""
+    entrada = _entrada_snapshot(ruta)
+    return entrada[1] if entrada else None
+
+
+def precargar_snapshots() -> None:
+    """Carga en memoria los snapshots persistidos o, si faltan, los empaquetados."""
+    for ruta in ARCHIVOS_SNAPSHOT:
+        if obtener_snapshot(ruta) is not None:
+            continue
+        empaquetado = DIR_SNAPSHOTS / ruta.name
+        try:
+            _SNAPSHOTS[ruta.name] = _cargar_snapshot(-1, empaquetado.read_bytes())
+        except Exception:
+            pass
+    log(f"Snapshots precargados: {len(_SNAPSHOTS)}/{len(ARCHIVOS_SNAPSHOT)}")
+    if MODO_SOLO_SERVIR and len(_SNAPSHOTS) < len(ARCHIVOS_SNAPSHOT):
+        faltan = [r.name for r in ARCHIVOS_SNAPSHOT if r.name not in _SNAPSHOTS]
+        log(f"⚠️ SOLO_SERVIR sin snapshot para {faltan} (ni en {DIR_SNAPSHOTS}): esos endpoints darán 503")
+
+
+def refrescar_en_segundo_plano(ruta: Path, refrescar) -> None:
+    """Lanza el scraping de `ruta` en un hilo, sin duplicar uno que ya corre."""
+    with _lock_refrescos:
+        if ruta.name in _refrescos_en_curso:
+            return
+        _refrescos_en_curso.add(ruta.name)
+
+    def tarea():
+        try:
+            refrescar()
+        except Exception as e:
+            log(f"❌ Error refrescando {ruta}: {e}")
+        finally:
+            with _lock_refrescos:
+                _refrescos_en_curso.discard(ruta.name)
+
+    threading.Thread(target=tarea, daemon=True).start()
+
+
+def responder_snapshot(ruta: Path, refrescar, necesita_actualizar: bool):
+    """
+    Responde con el snapshot de `ruta`. Si hay que actualizarlo y ya tenemos
+    uno en memoria, se sirve ese y se refresca en segundo plano; solo se
+    scrapea en línea cuando no hay nada que servir. En MODO_SOLO_SERVIR
+    nunca se scrapea.
+    """
+    if necesita_actualizar and not MODO_SOLO_SERVIR:
+        if obtener_snapshot(ruta) is None:
+            refrescar()
+        else:
+            refrescar_en_segundo_plano(ruta, refrescar)
+
+    datos = obtener_snapshot(ruta)
+    if datos is None:
+        return jsonify({"error": f"{ruta} no disponible"}), 503
+    return Response(datos, mimetype="application/json")
+
+
 # CONFIGURAR FLASK
 app = Flask(__name__)
 CORS(app)
 
+# Métricas de arranque -----------------------------------------
+METRICAS_ARRANQUE: Dict[str, Any] = {
+    "import_ms": None,
+    "primera_respuesta_ms": None,
+    "selenium_cargado": False,
+    "solo_servir": MODO_SOLO_SERVIR,
+}
+
+
+@app.after_request
+def _medir_primera_respuesta(resp):
+    if METRICAS_ARRANQUE["primera_respuesta_ms"] is None:
+        ms = (time.perf_counter() - _T_INICIO_IMPORT) * 1000
+        METRICAS_ARRANQUE["primera_respuesta_ms"] = round(ms, 1)
+        log(f"Primera respuesta a {ms:.0f} ms del inicio ({request.path})")
+    return resp
+
+
+@app.route('/status', methods=['GET'])
+def api_estado():
+    METRICAS_ARRANQUE["selenium_cargado"] = webdriver is not None
+    return jsonify({
+        **METRICAS_ARRANQUE,
+        "snapshots": {nombre: mtime != -1 for nombre, (mtime, _, _) in list(_SNAPSHOTS.items())},
+        "tiempo_listo": resumen_tiempos_listo(),
+    })
+
 # ========== FLASK ENDPOINTS ==========
 @app.route('/results')
 @app.route('/results/<path:dia>')
 def api_resultados(dia=None):
+    if dia and historial.es_fecha(dia):
+        datos = historial.resultados_por_fecha(date.fromisoformat(dia))
+        if datos is None:
+            return jsonify({"error": f"Sin datos archivados para {dia}"}), 404
+        return jsonify({"timestamp": datos["timestamp"], "fecha": datos["fecha"], "ligas": datos["ligas"]})
+
     dia_path = "" if not dia else dia
     salida = DIAS.get(dia_path, DIAS[""])[1]
 
-    if necesita_actualizar_dia(salida, dia_path):
-        scrapear_partidos(dia_path, salida)
-
-    try:
-        with open(salida, 'r', encoding='utf-8') as f:
-            datos = json.load(f)
-        return jsonify(datos)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return responder_snapshot(
+        salida,
+        lambda: scrapear_partidos(dia_path, salida),
+        necesita_actualizar_dia(salida, dia_path),
+    )
 
 
 
 @app.route('/standings', methods=['GET'])
 def api_tablas():
-    if not SALIDA_TABLAS_POSICIONES.exists():
-        scrapear_tablas_posiciones()
-
-    try:
-        with open(SALIDA_TABLAS_POSICIONES, 'r', encoding='utf-8') as f:
-            datos = json.load(f)
-        return jsonify(datos)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return responder_snapshot(
+        SALIDA_TABLAS_POSICIONES,
+        scrapear_tablas_posiciones,
+        not SALIDA_TABLAS_POSICIONES.exists(),
+    )
 
 
 @app.route('/games')
 @app.route('/games/<path:dia>')
 def api_detalles_jornada(dia=None):
+    if dia and historial.es_fecha(dia):
+        datos = historial.resultados_por_fecha(date.fromisoformat(dia))
+        if datos is None:
+            return jsonify({"error": f"Sin datos archivados para {dia}"}), 404
+        return jsonify({
+            "fecha": datos["fecha"],
+            "partidos_con_detalles": len(datos["detalles"]),
+            "detalles": datos["detalles"],
+        })
+
     dia_path = "" if not dia else dia
     salida = DIAS_DETALLES.get(dia_path, DIAS_DETALLES[""])[1]
 
-    if necesita_actualizar_dia(salida, dia_path):
-        scrapear_detalles_partidos(dia_path, salida)
+    return responder_snapshot(
+        salida,
+        lambda: scrapear_detalles_partidos(dia_path, salida),
+        necesita_actualizar_dia(salida, dia_path),
+    )
+
+
+
+
+
+@app.route('/history/<path:equipo>', methods=['GET'])
+def api_historial_equipo(equipo):
+    limite = request.args.get("limit", default=10, type=int)
+    partidos = historial.ultimos_partidos_equipo(equipo, max(1, min(limite, 100)))
+    return jsonify({"equipo": equipo, "partidos": partidos})
 
-    try:
-        with open(salida, 'r', encoding='utf-8') as f:
-            datos = json.load(f)
-        return jsonify(datos)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
 
+@app.route('/match/<path:href>', methods=['GET'])
+def api_partido_archivado(href):
+    partido = historial.buscar_partido("/" + href.lstrip("/"))
+    if partido is None:
+        return jsonify({"error": "Partido no encontrado en el historial"}), 404
+    return jsonify(partido)
 
 
+@app.route('/logos/proxy', methods=['GET'])
+def api_logo_proxy():
+    url = request.args.get("url", "")
+    if not logos.url_permitida(url):
+        return jsonify({"error": "Solo se aceptan escudos de Promiedos"}), 400
+    entrada = logos.asegurar(url, timeout=logos.TIMEOUT_DESCARGA)
+    if entrada is None:
+        return redirect(url, code=302)  # si falla la descarga, usamos el remoto (host ya validado)
+    tam = request.args.get("size", type=int)
+    ruta = logos.ruta_publica(entrada["hash"], entrada["ext"], tam)
+    # Si falta la variante pedida servimos el original, pero sin redirect
+    # permanente: la variante puede aparecer más adelante
+    falta_variante = tam in logos.TAMANIOS_LOGO and not ruta.endswith(f"-{tam}.{entrada['ext']}")
+    return redirect(ruta, code=302 if falta_variante else 301)
+
+
+@app.route('/logos/<nombre>', methods=['GET'])
+def api_logo(nombre):
+    if not logos.RE_ARCHIVO_LOGO.match(nombre):
+        abort(404)
+    # El nombre es el hash del contenido: nunca cambia → caché inmutable
+    resp = send_from_directory(
+        logos.DIR_LOGOS.resolve(), nombre, etag=nombre.rsplit(".", 1)[0], max_age=31536000
+    )
+    resp.headers["Cache-Control"] = logos.CACHE_CONTROL_LOGOS
+    return resp
 
 
 @app.route('/eventos', methods=['GET'])
 def api_eventos():
-    try:
-        scrapear_eventos()
-        with open("eventos.json", "r", encoding="utf-8") as f:
-            datos = json.load(f)
-        return jsonify(datos)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return responder_snapshot(SALIDA_EVENTOS, scrapear_eventos, True)
 
 
 @app.route('/canales', methods=['GET'])
 def api_canales():
-    try:
-        scrapear_canales()
-        with open(SALIDA_CANALES, "r", encoding="utf-8") as f:
-            datos = json.load(f)
-        return jsonify(datos)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return responder_snapshot(SALIDA_CANALES, scrapear_canales, True)
 
 # ========== LOOP DE SCRAPING EN SEGUNDO PLANO ==========
 INTERVALO_LOOP = 30  # segundos
@@ -780,6 +1195,7 @@ INTERVALO_LOOP = 30  # segundos
 def loop_scraping():
     contador = 0
     log("🧠 Hilo de scraping iniciado")
+    iniciar_salud_links()
     while True:
         try:
             log(f"🌀 Iteración #{contador}")
@@ -806,3 +1222,7 @@ def loop_scraping():
 #*
 # Esto permite que Vercel importe la app sin ejecutar nada extra
 app = app
+
+precargar_snapshots()
+METRICAS_ARRANQUE["import_ms"] = round((time.perf_counter() - _T_INICIO_IMPORT) * 1000, 1)
+log(f"app importada en {METRICAS_ARRANQUE['import_ms']:.0f} ms (solo_servir={MODO_SOLO_SERVIR})")
@@ -0,0 +1,129 @@
+# ============================================================================
+# bench_arranque.py – Benchmark de arranque en frío (import + primera respuesta)
+# ============================================================================
+# ➟ Lanza N procesos nuevos de Python que importan app.py en modo solo-servir
+#   contra un snapshot de prueba y miden:
+#       • import_ms             tiempo de `import app`
+#       • primera_respuesta_ms  desde el inicio del import hasta responder /results
+#       • si Selenium quedó importado (no debería en modo solo-servir)
+# ➟ Sale con código 1 si la mediana supera el presupuesto, para usarlo en CI:
+#       python bench_arranque.py --runs 5 --budget-import-ms 1500
+# ----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+DIR_APP = Path(__file__).resolve().parent
+
+# Código que corre cada proceso hijo (proceso nuevo = cold start real)
+SCRIPT_HIJO = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+resp = app.app.test_client().get("/results")
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "primera_respuesta_ms": (t2 - t0) * 1000,
+    "status": resp.status_code,
+    "selenium": any(m == "selenium" or m.startswith("selenium.") for m in sys.modules),
+}))
+"""
+
+
+def snapshot_prueba(cantidad_partidos: int = 150) -> dict:
+    """Snapshot con el formato de partidos.json y un sábado cargado de partidos."""
+    ligas = []
+    for i in range(0, cantidad_partidos, 10):
+        ligas.append({
+            "liga": f"Liga {i // 10}",
+            "partidos": [
+                {
+                    "equipo1": f"Equipo {j}A",
+                    "logo1": f"https://api.promiedos.com.ar/images/team/{j}a/1",
+                    "goles1": "1",
+                    "goleadores1": [f"{j % 90}' Jugador {j}"],
+                    "equipo2": f"Equipo {j}B",
+                    "logo2": f"https://api.promiedos.com.ar/images/team/{j}b/1",
+                    "goles2": "0",
+                    "goleadores2": [],
+                    "minuto": "Final",
+                    "href": f"/game/equipo-{j}a-vs-equipo-{j}b/{j}",
+                }
+                for j in range(i, min(i + 10, cantidad_partidos))
+            ],
+        })
+    return {"timestamp": "2025-06-14T20:00:00", "ligas": ligas}
+
+
+def medir(runs: int) -> list[dict]:
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        dir_snapshots = Path(tmp) / "snapshots"
+        dir_trabajo = Path(tmp) / "trabajo"  # sin archivos persistidos
+        dir_snapshots.mkdir()
+        dir_trabajo.mkdir()
+        (dir_snapshots / "partidos.json").write_text(
+            json.dumps(snapshot_prueba(), ensure_ascii=False), encoding="utf-8"
+        )
+        env = {
+            **os.environ,
+            "SOLO_SERVIR": "1",
+            "DIR_SNAPSHOTS": str(dir_snapshots),
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(DIR_APP), os.environ.get("PYTHONPATH")])),
+        }
+        for _ in range(runs):
+            salida = subprocess.run(
+                [sys.executable, "-c", SCRIPT_HIJO],
+                cwd=dir_trabajo, env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            resultados.append(json.loads(salida.strip().splitlines()[-1]))
+    return resultados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío de app.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-import-ms", type=float, default=1500)
+    parser.add_argument("--budget-primera-ms", type=float, default=2000)
+    parser.add_argument("--json", type=Path, help="guardar el reporte en este archivo")
+    args = parser.parse_args()
+
+    resultados = medir(args.runs)
+    reporte = {
+        "runs": args.runs,
+        "import_ms_mediana": round(statistics.median(r["import_ms"] for r in resultados), 1),
+        "primera_respuesta_ms_mediana": round(statistics.median(r["primera_respuesta_ms"] for r in resultados), 1),
+        "selenium_importado": any(r["selenium"] for r in resultados),
+        "status": sorted({r["status"] for r in resultados}),
+        "presupuesto": {"import_ms": args.budget_import_ms, "primera_respuesta_ms": args.budget_primera_ms},
+    }
+
+    fallas = []
+    if reporte["import_ms_mediana"] > args.budget_import_ms:
+        fallas.append(f"import {reporte['import_ms_mediana']} ms > {args.budget_import_ms} ms")
+    if reporte["primera_respuesta_ms_mediana"] > args.budget_primera_ms:
+        fallas.append(f"primera respuesta {reporte['primera_respuesta_ms_mediana']} ms > {args.budget_primera_ms} ms")
+    if reporte["selenium_importado"]:
+        fallas.append("Selenium se importó en modo solo-servir")
+    if reporte["status"] != [200]:
+        fallas.append(f"/results respondió {reporte['status']}")
+    reporte["fallas"] = fallas
+
+    print(json.dumps(reporte, indent=2, ensure_ascii=False))
+    if args.json:
+        args.json.write_text(json.dumps(reporte, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+# ============================================================================
+# bench_carga.py – Prueba de carga HTTP de la API Flask
+# ============================================================================
+# ➟ Levanta gunicorn con los scrapers reemplazados por stubs (nunca abre un
+#   navegador) sobre snapshots de prueba de tamaño real: un sábado con 150
+#   partidos, sus detalles, las 21 tablas de posiciones, canales y eventos.
+# ➟ Para cada combinación de workers × concurrencia golpea /results, /games,
+#   /standings, /eventos y /canales durante --duration segundos y reporta:
+#       • throughput (req/s) y errores
+#       • latencia p50 / p95 / p99 (ms)
+#       • memoria residente (RSS) por worker (Linux, vía /proc)
+# ➟ El reporte se imprime y, con --json, se guarda para comparar cambios:
+#       python bench_carga.py --workers 1,2,4 --concurrency 1,8,32 --json carga.json
+# ----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bench_arranque import DIR_APP, snapshot_prueba
+
+ENDPOINTS = ["/results", "/results/ayer", "/games", "/standings", "/eventos", "/canales"]
+
+# Mismas claves que app.PROMEDIOSINFO_LIGAS. Van copiadas porque importar app
+# en el proceso del benchmark precarga los snapshots del directorio actual.
+LIGAS_PRUEBA = [
+    "liga/argentina.html", "liga/premier-league.html", "liga/la-liga.html", "liga/bundesliga.html",
+    "liga/primera-b-nacional.html", "liga/brasileirao.html", "liga/portugal.html", "liga/arabia-saudita.html",
+    "liga/ligue-1.html", "liga/eredivisie.html", "liga/uruguay.html", "liga/paraguay.html", "liga/chile.html",
+    "liga/colombia.html", "liga/ecuador.html", "liga/peru.html", "liga/liga-mx.html", "liga/mls.html",
+    "liga/segunda-division-espana.html", "liga/turquia.html", "liga/championship.html",
+]
+
+# ────────────────────────────── App con stubs ───────────────────────────────
+
+def crear_app():
+    """
+    Fábrica para gunicorn (`bench_carga:crear_app()`): importa la app y
+    reemplaza cada scraper por un no-op, así la carga mide solo el servidor.
+    """
+    import app as modulo_app
+
+    def stub(*_args, **_kwargs) -> None:
+        return None
+
+    for nombre in (
+        "scrapear_partidos",
+        "scrapear_detalles_partidos",
+        "scrapear_tablas_posiciones",
+        "scrapear_eventos",
+        "scrapear_canales",
+    ):
+        setattr(modulo_app, nombre, stub)
+    return modulo_app.app
+
+# ────────────────────────────── Fixtures ────────────────────────────────────
+
+def detalles_prueba(partidos: Dict[str, Any]) -> Dict[str, Any]:
+    """Detalles con eventos, estadísticas y alineaciones completas por partido."""
+    detalles = []
+    for liga in partidos["ligas"]:
+        for p in liga["partidos"]:
+            detalles.append({
+                "href": p["href"],
+                "equipo1": p["equipo1"],
+                "equipo2": p["equipo2"],
+                "detalles": {
+                    "eventos_calendario": [
+                        {"texto": f"{m}' Evento {m}", "imagen": "https://www.promiedos.com.ar/images/icons/gol.png"}
+                        for m in range(5, 95, 10)
+                    ],
+                    "stats": [f"Estadística {k}\n{k * 3}\n{k * 2}" for k in range(12)],
+                    "alineaciones": {
+                        "local": [f"Jugador local {k}" for k in range(18)],
+                        "visitante": [f"Jugador visitante {k}" for k in range(18)],
+                    },
+                },
+            })
+    return {"timestamp": partidos["timestamp"], "partidos_con_detalles": len(detalles), "detalles": detalles}
+
+
+def tablas_prueba() -> Dict[str, Any]:
+    tablas = {}
+    for liga in LIGAS_PRUEBA:
+        filas = [
+            {"posicion": str(k + 1), "equipo": f"Equipo {k}", "pts": str(60 - k * 2), "pj": "30",
+             "pg": str(18 - k // 2), "pe": "6", "pp": str(6 + k // 2)}
+            for k in range(20)
+        ]
+        fechas = [
+            {"titulo": f"Fecha {f}", "partidos": [
+                {"local": f"Equipo {k}", "visitante": f"Equipo {k + 10}", "hora": "21:00",
+                 "resultado": "1 - 0", "estado": "Final"}
+                for k in range(10)
+            ]}
+            for f in range(1, 6)
+        ]
+        tablas[liga] = {"tablas": {"Zona A": filas}, "fechas": fechas}
+    return {"timestamp": "2025-06-14T20:00:00", "tablas": tablas}
+
+
+def escribir_fixtures(destino: Path) -> None:
+    """Escribe los archivos de salida tal como los deja el scraper (indent=2)."""
+    hoy = snapshot_prueba(150)
+    ayer = snapshot_prueba(120)
+    man = snapshot_prueba(80)
+    archivos = {
+        "partidos.json": hoy,
+        "partidos_ayer.json": ayer,
+        "partidos_man.json": man,
+        "detalles_partidos_hoy.json": detalles_prueba(hoy),
+        "detalles_partidos_ayer.json": detalles_prueba(ayer),
+        "detalles_partidos_man.json": detalles_prueba(man),
+        "tablas_posiciones.json": tablas_prueba(),
+        "canales.json": {"timestamp": hoy["timestamp"], "canales": [
+            {"canal": f"canal{k}", "link": f"https://la14hd.com/vivo/canal.php?stream=canal{k}"} for k in range(80)
+        ]},
+        "eventos.json": {"timestamp": hoy["timestamp"], "eventos": {
+            f"equipo {k}a vs equipo {k}b": f"https://la14hd.com/vivo/canales.php?stream=ev{k}" for k in range(40)
+        }},
+    }
+    for nombre, datos in archivos.items():
+        (destino / nombre).write_text(json.dumps(datos, indent=2, ensure_ascii=False), encoding="utf-8")
+
+# ────────────────────────────── Servidor ────────────────────────────────────
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def esperar_servidor(puerto: int, timeout: float = 30) -> None:
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", puerto, timeout=2)
+            conn.request("GET", "/status")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn no respondió en {timeout} s")
+
+
+def rss_workers_mb(pid_master: int) -> List[float]:
+    """RSS de cada worker hijo de gunicorn (solo Linux; vacío si no hay /proc)."""
+    rss = []
+    proc = Path("/proc")
+    if not proc.exists():
+        return rss
+    for d in proc.iterdir():
+        if not d.name.isdigit():
+            continue
+        try:
+            status = (d / "status").read_text()
+        except OSError:
+            continue
+        campos = dict(linea.split(":", 1) for linea in status.splitlines() if ":" in linea)
+        if int(campos.get("PPid", "0").strip()) == pid_master and "VmRSS" in campos:
+            rss.append(round(int(campos["VmRSS"].split()[0]) / 1024, 1))
+    return sorted(rss)
+
+# ────────────────────────────── Carga ───────────────────────────────────────
+
+def generar_carga(puerto: int, concurrencia: int, duracion: float) -> Dict[str, Any]:
+    """Cada hilo hace requests en secuencia rotando los endpoints hasta agotar el tiempo."""
+    latencias: List[List[float]] = [[] for _ in range(concurrencia)]
+    errores = [0] * concurrencia
+    fin = time.perf_counter() + duracion
+
+    def cliente(i: int) -> None:
+        k = i
+        conn = http.client.HTTPConnection("127.0.0.1", puerto, timeout=30)
+        while time.perf_counter() < fin:
+            ruta = ENDPOINTS[k % len(ENDPOINTS)]
+            k += 1
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", ruta)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    errores[i] += 1
+                if resp.getheader("Connection", "").lower() == "close":
+                    conn.close()  # los workers sync de gunicorn no hacen keep-alive
+            except (OSError, http.client.HTTPException):
+                errores[i] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", puerto, timeout=30)
+                continue
+            latencias[i].append((time.perf_counter() - t0) * 1000)
+        conn.close()
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=cliente, args=(i,)) for i in range(concurrencia)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    transcurrido = time.perf_counter() - inicio
+
+    todas = sorted(l for lista in latencias for l in lista)
+    if len(todas) >= 2:
+        cuantiles = statistics.quantiles(todas, n=100, method="inclusive")
+        p50, p95, p99 = cuantiles[49], cuantiles[94], cuantiles[98]
+    else:
+        p50 = p95 = p99 = todas[0] if todas else None
+    return {
+        "requests": len(todas),
+        "errores": sum(errores),
+        "rps": round(len(todas) / transcurrido, 1),
+        "p50_ms": round(p50, 2) if p50 is not None else None,
+        "p95_ms": round(p95, 2) if p95 is not None else None,
+        "p99_ms": round(p99, 2) if p99 is not None else None,
+    }
+
+
+def correr_escenario(
+    dir_trabajo: Path, workers: int, concurrencias: List[int], duracion: float, solo_servir: bool
+) -> List[Dict[str, Any]]:
+    puerto = puerto_libre()
+    env = {
+        **os.environ,
+        "SOLO_SERVIR": "1" if solo_servir else "0",
+        "SALUD_LINKS": "0",  # sin verificación de links: no salir a la red
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(DIR_APP), os.environ.get("PYTHONPATH")])),
+    }
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{puerto}",
+         "--log-level", "warning", "bench_carga:crear_app()"],
+        cwd=dir_trabajo, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    resultados = []
+    try:
+        esperar_servidor(puerto)
+        generar_carga(puerto, workers, 1.0)  # calentamiento: precarga en cada worker
+        for concurrencia in concurrencias:
+            r = generar_carga(puerto, concurrencia, duracion)
+            r.update({"workers": workers, "concurrencia": concurrencia, "rss_worker_mb": rss_workers_mb(servidor.pid)})
+            print(
+                f"workers={workers:<2} conc={concurrencia:<3} {r['rps']:>8.1f} req/s  "
+                f"p50={r['p50_ms']} p95={r['p95_ms']} p99={r['p99_ms']} ms  "
+                f"errores={r['errores']}  rss={r['rss_worker_mb']} MB",
+                flush=True,
+            )
+            resultados.append(r)
+    finally:
+        servidor.terminate()
+        try:
+            servidor.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            servidor.kill()
+    return resultados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga HTTP de la API Flask")
+    parser.add_argument("--workers", default="1,2,4", help="lista de cantidades de workers gunicorn")
+    parser.add_argument("--concurrency", default="1,8,32", help="lista de niveles de concurrencia")
+    parser.add_argument("--duration", type=float, default=10, help="segundos por nivel")
+    parser.add_argument("--solo-servir", action="store_true", help="correr la app con SOLO_SERVIR=1")
+    parser.add_argument("--json", type=Path, help="guardar el reporte en este archivo")
+    args = parser.parse_args()
+
+    workers = [int(w) for w in args.workers.split(",")]
+    concurrencias = [int(c) for c in args.concurrency.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dir_trabajo = Path(tmp)
+        escribir_fixtures(dir_trabajo)
+        resultados = []
+        for w in workers:
+            resultados.extend(correr_escenario(dir_trabajo, w, concurrencias, args.duration, args.solo_servir))
+
+    reporte = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "endpoints": ENDPOINTS,
+        "duracion_s": args.duration,
+        "solo_servir": args.solo_servir,
+        "resultados": resultados,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(reporte, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Reporte guardado en {args.json}")
+    return 1 if any(r["errores"] for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# ============================================================================
+# bench_memoria.py – Memoria residente de los snapshots en memoria
+# ============================================================================
+# ➟ Carga los 9 snapshots de prueba de bench_carga (hoy/ayer/mañana, sus
+#   detalles, tablas, canales y eventos) con cada representación y mide
+#   cuánta memoria retienen (tracemalloc) y el RSS del proceso:
+#       • bytes    JSON compacto listo para responder (lo que guarda app.py)
+#       • dicts    json.loads de cada archivo, serializando en cada respuesta
+# ➟ «vs_bytes» compara cada variante contra bytes, la línea de base.
+# ➟ Un modelo con __slots__ + strings internadas retenía 1.6x lo de bytes y
+#   costaba ~20 ms serializar por respuesta: por eso app.py guarda bytes.
+# ➟ Cada variante corre en un proceso nuevo para no compartir registros:
+#       python bench_memoria.py --json memoria.json
+# ----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_arranque import DIR_APP
+
+VARIANTES = ["bytes", "dicts"]
+
+SCRIPT_HIJO = r"""
+import gc, json, sys, time, tracemalloc
+from pathlib import Path
+
+def rss_kb():
+    try:
+        for linea in Path("/proc/self/status").read_text().splitlines():
+            if linea.startswith("VmRSS:"):
+                return int(linea.split()[1])
+    except OSError:
+        pass
+    return None
+
+variante, carpeta = sys.argv[1], Path(sys.argv[2])
+crudos = [f.read_bytes() for f in sorted(carpeta.glob("*.json"))]
+
+gc.collect()
+rss0 = rss_kb()
+tracemalloc.start()
+t0 = time.perf_counter()
+if variante == "dicts":
+    retenido = [json.loads(c) for c in crudos]
+else:
+    retenido = [json.dumps(json.loads(c), ensure_ascii=False, separators=(",", ":")).encode() for c in crudos]
+carga_ms = (time.perf_counter() - t0) * 1000
+gc.collect()
+actual, pico = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+rss1 = rss_kb()
+
+# Costo de armar los bytes de respuesta desde la representación retenida
+t0 = time.perf_counter()
+for _ in range(20):
+    if variante == "dicts":
+        [json.dumps(d, ensure_ascii=False, separators=(",", ":")).encode() for d in retenido]
+serializar_ms = (time.perf_counter() - t0) * 1000 / 20
+
+print(json.dumps({
+    "variante": variante,
+    "retenido_kb": round(actual / 1024, 1),
+    "pico_kb": round(pico / 1024, 1),
+    "rss_delta_kb": (rss1 - rss0) if rss0 is not None and rss1 is not None else None,
+    "carga_ms": round(carga_ms, 1),
+    "serializar_ms": round(serializar_ms, 2),
+}))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Memoria retenida por los snapshots en memoria")
+    parser.add_argument("--json", type=Path, help="guardar el reporte en este archivo")
+    args = parser.parse_args()
+
+    from bench_carga import escribir_fixtures
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        escribir_fixtures(Path(tmp))
+        tamanio_disco = sum(f.stat().st_size for f in Path(tmp).glob("*.json"))
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(DIR_APP), os.environ.get("PYTHONPATH")])),
+        }
+        base = None
+        for variante in VARIANTES:
+            salida = subprocess.run(
+                [sys.executable, "-c", SCRIPT_HIJO, variante, tmp],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            r = json.loads(salida.strip().splitlines()[-1])
+            base = base or r["retenido_kb"]
+            r["vs_bytes"] = round(r["retenido_kb"] / base, 2)
+            print(
+                f"{r['variante']:<7} retenido={r['retenido_kb']:>8} KB ({r['vs_bytes']}x)  rss+={r['rss_delta_kb']} KB  "
+                f"carga={r['carga_ms']} ms  serializar={r['serializar_ms']} ms"
+            )
+            resultados.append(r)
+
+    reporte = {"archivos_kb": round(tamanio_disco / 1024, 1), "resultados": resultados}
+    if args.json:
+        args.json.write_text(json.dumps(reporte, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Reporte guardado en {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
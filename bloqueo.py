@@ -0,0 +1,62 @@
+# ============================================================================
+# bloqueo.py – Locks de archivo entre procesos (workers de gunicorn)
+# ============================================================================
+# ➟ threading.Lock solo sirve dentro de un proceso; con `gunicorn -w N` cada
+#   worker es un proceso aparte. Estos helpers usan flock sobre un archivo
+#   .lock para serializar escrituras (o elegir un único «líder») entre todos.
+# ➟ En Windows (sin fcntl) no hay lock entre procesos: ahí se corre con un
+#   solo proceso (python app.py / flask run), así que alcanza con el de hilos.
+# ----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_locks_hilos: dict = {}
+_lock_registro = threading.Lock()
+
+
+def _lock_hilos(ruta: Path) -> threading.Lock:
+    with _lock_registro:
+        return _locks_hilos.setdefault(str(ruta.resolve()), threading.Lock())
+
+
+@contextlib.contextmanager
+def bloqueo_exclusivo(ruta: Path) -> Iterator[None]:
+    """Lock exclusivo (bloqueante) entre hilos y procesos sobre `ruta`."""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with _lock_hilos(ruta):
+        with open(ruta, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def tomar_liderazgo(ruta: Path) -> Optional[IO]:
+    """
+    Intenta tomar (sin bloquear) el lock de `ruta` para todo el proceso.
+    Devuelve el archivo abierto (mantenerlo abierto conserva el lock) o None
+    si otro proceso ya es el líder.
+    """
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    f = open(ruta, "a+b")
+    if fcntl is None:
+        return f
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
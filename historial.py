@@ -0,0 +1,364 @@
+# ============================================================================
+# historial.py – Archivo histórico comprimido de partidos (por temporada)
+# ============================================================================
+# ➟ Cada día terminado (snapshot de «ayer») se agrega a un archivo
+#   append-only por temporada:
+#       historial/<año>/datos.bin      frames zlib: por día, un encabezado
+#                                      (orden de ligas) + uno por partido
+#       historial/<año>/fechas.idx     fecha → rango de offsets en datos.bin
+#                                      (+ si incluye detalles)
+#       historial/<año>/equipos.idx    hash(equipo) → offset del partido
+#       historial/<año>/hrefs.idx      hash(href)   → offset del partido
+# ➟ Los índices son registros binarios de tamaño fijo que se leen con mmap,
+#   así que las consultas por fecha, equipo o href solo descomprimen los
+#   frames que devuelven y usan memoria constante sin importar cuántas
+#   temporadas haya guardadas.
+# ➟ El registro en fechas.idx se escribe último y marca el día como completo:
+#   todo lo que quede después del último día confirmado (proceso cortado a
+#   mitad de escritura) se ignora al leer y se trunca antes del reintento.
+# ➟ Un día archivado sin detalles se puede volver a archivar cuando llegan:
+#   la versión nueva se agrega al final y las consultas usan solo la última
+#   versión de cada fecha.
+# ----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import re
+import struct
+import unicodedata
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bloqueo import bloqueo_exclusivo
+
+# ────────────────────────────── Configuración ───────────────────────────────
+
+DIR_HISTORIAL = Path("historial")
+NIVEL_COMPRESION = 9
+
+ARCHIVO_DATOS = "datos.bin"
+ARCHIVO_FECHAS = "fechas.idx"
+ARCHIVO_EQUIPOS = "equipos.idx"
+ARCHIVO_HREFS = "hrefs.idx"
+ARCHIVO_LOCK = "escritura.lock"  # en DIR_HISTORIAL, compartido entre workers
+
+# Formatos binarios (little-endian, tamaño fijo) ---------------
+FMT_FRAME = struct.Struct("<I")      # largo del frame comprimido
+FMT_FECHA = struct.Struct("<IQQB")   # fecha AAAAMMDD, offset inicio, offset fin, con detalles
+FMT_CLAVE = struct.Struct("<QIQ")    # hash clave, fecha AAAAMMDD, offset frame
+
+RE_FECHA = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# ────────────────────────────── Utilidades ──────────────────────────────────
+
+def es_fecha(txt: str) -> bool:
+    """True si txt tiene formato AAAA-MM-DD válido."""
+    if not txt or not RE_FECHA.match(txt):
+        return False
+    try:
+        date.fromisoformat(txt)
+        return True
+    except ValueError:
+        return False
+
+
+def _fecha_a_int(fecha: date) -> int:
+    return fecha.year * 10000 + fecha.month * 100 + fecha.day
+
+
+def _normalizar(txt: str) -> str:
+    """Normaliza nombres de equipo para comparar (sin tildes ni mayúsculas)."""
+    txt = unicodedata.normalize("NFKD", txt or "").encode("ascii", "ignore").decode()
+    return " ".join(txt.casefold().split())
+
+
+def _hash_clave(txt: str) -> int:
+    """Hash estable de 64 bits (hash() de Python cambia entre procesos)."""
+    return int.from_bytes(hashlib.blake2b(txt.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _dir_temporada(base: Path, temporada: int) -> Path:
+    return base / str(temporada)
+
+
+def _temporadas(base: Path) -> List[int]:
+    """Temporadas archivadas, de la más reciente a la más antigua."""
+    if not base.exists():
+        return []
+    return sorted((int(p.name) for p in base.iterdir() if p.is_dir() and p.name.isdigit()), reverse=True)
+
+
+def _registros_inversos(ruta: Path, fmt: struct.Struct) -> Iterator[Tuple]:
+    """
+    Recorre un índice de registros fijos desde el final usando mmap.
+    Solo mira los registros completos presentes al abrir el archivo.
+    """
+    if not ruta.exists() or ruta.stat().st_size < fmt.size:
+        return
+    with open(ruta, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        cantidad = len(mm) // fmt.size
+        for i in range(cantidad - 1, -1, -1):
+            yield fmt.unpack_from(mm, i * fmt.size)
+
+
+def _fin_confirmado(dir_temp: Path) -> int:
+    """Offset en datos.bin donde termina el último día completo (0 si no hay)."""
+    ultimo = next(_registros_inversos(dir_temp / ARCHIVO_FECHAS, FMT_FECHA), None)
+    return ultimo[2] if ultimo else 0
+
+
+def _rangos_vigentes(dir_temp: Path) -> Dict[int, Tuple[int, int]]:
+    """fecha → (inicio, fin) de su última versión archivada (pocos cientos por temporada)."""
+    rangos: Dict[int, Tuple[int, int]] = {}
+    for fecha, ini, fin, _det in _registros_inversos(dir_temp / ARCHIVO_FECHAS, FMT_FECHA):
+        rangos.setdefault(fecha, (ini, fin))
+    return rangos
+
+
+def _truncar(ruta: Path, largo: int) -> None:
+    if ruta.exists() and ruta.stat().st_size > largo:
+        with open(ruta, "r+b") as f:
+            f.truncate(largo)
+
+
+def _reparar(dir_temp: Path) -> None:
+    """
+    Descarta lo escrito después del último día confirmado (frames e índices
+    de un archivado que se cortó), para que el reintento no duplique nada.
+    """
+    fechas = dir_temp / ARCHIVO_FECHAS
+    if fechas.exists():
+        _truncar(fechas, fechas.stat().st_size // FMT_FECHA.size * FMT_FECHA.size)
+    fin = _fin_confirmado(dir_temp)
+    _truncar(dir_temp / ARCHIVO_DATOS, fin)
+    for nombre in (ARCHIVO_EQUIPOS, ARCHIVO_HREFS):
+        ruta = dir_temp / nombre
+        if not ruta.exists():
+            continue
+        # Los offsets crecen en orden de escritura: se cortan desde el final
+        validos = ruta.stat().st_size // FMT_CLAVE.size
+        for _h, _f, offset in _registros_inversos(ruta, FMT_CLAVE):
+            if offset < fin:
+                break
+            validos -= 1
+        _truncar(ruta, validos * FMT_CLAVE.size)
+
+
+def _escribir_frame(f, registro: Dict[str, Any]) -> int:
+    """Agrega un frame comprimido al final de datos.bin; devuelve su offset."""
+    comprimido = zlib.compress(
+        json.dumps(registro, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        NIVEL_COMPRESION,
+    )
+    offset = f.tell()
+    f.write(FMT_FRAME.pack(len(comprimido)))
+    f.write(comprimido)
+    return offset
+
+
+def _leer_frame(datos: mmap.mmap, offset: int) -> Tuple[Dict[str, Any], int]:
+    """Descomprime el frame en offset; devuelve (registro, offset siguiente)."""
+    (largo,) = FMT_FRAME.unpack_from(datos, offset)
+    inicio = offset + FMT_FRAME.size
+    registro = json.loads(zlib.decompress(datos[inicio:inicio + largo]))
+    return registro, inicio + largo
+
+
+def _abrir_datos(dir_temp: Path) -> Optional[Tuple[Any, mmap.mmap]]:
+    ruta = dir_temp / ARCHIVO_DATOS
+    if not ruta.exists() or ruta.stat().st_size == 0:
+        return None
+    f = open(ruta, "rb")
+    return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+# ───────────────────────────── Escritura ────────────────────────────────────
+
+def _estado_fecha(fecha: date, base: Path) -> Optional[bool]:
+    """None si el día no está archivado; si está, True/False según tenga detalles."""
+    objetivo = _fecha_a_int(fecha)
+    ruta = _dir_temporada(base, fecha.year) / ARCHIVO_FECHAS
+    return next((bool(det) for f, _i, _f, det in _registros_inversos(ruta, FMT_FECHA) if f == objetivo), None)
+
+
+def fecha_archivada(fecha: date, base: Path = DIR_HISTORIAL) -> bool:
+    """True si el día ya fue agregado al historial."""
+    return _estado_fecha(fecha, base) is not None
+
+
+def archivar_dia(
+    fecha: date,
+    partidos: Dict[str, Any],
+    detalles: Optional[Dict[str, Any]] = None,
+    base: Path = DIR_HISTORIAL,
+) -> int:
+    """
+    Agrega los partidos (y sus detalles, si hay) de un día terminado al
+    historial de su temporada. Es idempotente: si la fecha ya está archivada
+    no hace nada, salvo que se haya archivado sin detalles y ahora los haya.
+    Devuelve la cantidad de partidos escritos.
+    """
+    detalles_por_href = {
+        d["href"]: d.get("detalles")
+        for d in (detalles or {}).get("detalles", [])
+        if d.get("href")
+    }
+    fecha_int = _fecha_a_int(fecha)
+    dir_temp = _dir_temporada(base, fecha.year)
+
+    # Lock de archivo: con varios workers de gunicorn más de uno puede intentarlo
+    with bloqueo_exclusivo(base / ARCHIVO_LOCK):
+        estado = _estado_fecha(fecha, base)
+        if estado or (estado is False and not detalles_por_href):
+            return 0
+        dir_temp.mkdir(parents=True, exist_ok=True)
+        _reparar(dir_temp)
+
+        ligas = partidos.get("ligas", [])
+        claves_equipos: List[bytes] = []
+        claves_hrefs: List[bytes] = []
+        escritos = 0
+
+        # Primero los datos: un índice nunca apunta a un frame incompleto
+        with open(dir_temp / ARCHIVO_DATOS, "ab") as f_datos:
+            inicio = f_datos.tell()
+            # Encabezado del día: orden de las ligas (incluidas las vacías)
+            _escribir_frame(f_datos, {
+                "fecha": fecha.isoformat(),
+                "timestamp": partidos.get("timestamp"),
+                "ligas": [[liga.get("liga"), len(liga.get("partidos", []))] for liga in ligas],
+            })
+            for liga in ligas:
+                for partido in liga.get("partidos", []):
+                    href = partido.get("href")
+                    offset = _escribir_frame(f_datos, {
+                        "fecha": fecha.isoformat(),
+                        "liga": liga.get("liga"),
+                        "partido": partido,
+                        "detalles": detalles_por_href.get(href) if href else None,
+                    })
+                    escritos += 1
+
+                    for equipo in (partido.get("equipo1"), partido.get("equipo2")):
+                        if equipo:
+                            claves_equipos.append(FMT_CLAVE.pack(_hash_clave(_normalizar(equipo)), fecha_int, offset))
+                    if href:
+                        claves_hrefs.append(FMT_CLAVE.pack(_hash_clave(href), fecha_int, offset))
+            fin = f_datos.tell()
+
+        with open(dir_temp / ARCHIVO_EQUIPOS, "ab") as f:
+            f.write(b"".join(claves_equipos))
+        with open(dir_temp / ARCHIVO_HREFS, "ab") as f:
+            f.write(b"".join(claves_hrefs))
+        # La fecha va última: marca el día como completo
+        with open(dir_temp / ARCHIVO_FECHAS, "ab") as f:
+            f.write(FMT_FECHA.pack(fecha_int, inicio, fin, 1 if detalles_por_href else 0))
+
+    return escritos
+
+# ───────────────────────────── Consultas ────────────────────────────────────
+
+def resultados_por_fecha(fecha: date, base: Path = DIR_HISTORIAL) -> Optional[Dict[str, Any]]:
+    """
+    Reconstruye el snapshot de partidos de una fecha archivada con el mismo
+    formato que partidos*.json. Devuelve None si la fecha no está archivada.
+    """
+    objetivo = _fecha_a_int(fecha)
+    dir_temp = _dir_temporada(base, fecha.year)
+    rango = next(
+        ((ini, fin) for f, ini, fin, _det in _registros_inversos(dir_temp / ARCHIVO_FECHAS, FMT_FECHA) if f == objetivo),
+        None,
+    )
+    if rango is None:
+        return None
+
+    abierto = _abrir_datos(dir_temp)
+    if abierto is None:
+        return None
+    f, datos = abierto
+
+    ligas: List[Dict[str, Any]] = []
+    detalles: List[Dict[str, Any]] = []
+    try:
+        encabezado, offset = _leer_frame(datos, rango[0])
+        for nombre, cantidad in encabezado["ligas"]:
+            liga = {"liga": nombre, "partidos": []}
+            for _ in range(cantidad):
+                registro, offset = _leer_frame(datos, offset)
+                partido = registro["partido"]
+                liga["partidos"].append(partido)
+                if registro.get("detalles") is not None:
+                    detalles.append({
+                        "href": partido.get("href"),
+                        "equipo1": partido.get("equipo1"),
+                        "equipo2": partido.get("equipo2"),
+                        "detalles": registro["detalles"],
+                    })
+            ligas.append(liga)
+    finally:
+        datos.close()
+        f.close()
+
+    return {
+        "fecha": fecha.isoformat(),
+        "timestamp": encabezado.get("timestamp"),
+        "ligas": ligas,
+        "detalles": detalles,
+    }
+
+
+def _buscar_por_clave(
+    archivo_idx: str, hash_clave: int, limite: int, base: Path, coincide
+) -> List[Dict[str, Any]]:
+    """Recorre los índices de las temporadas (más recientes primero)."""
+    encontrados: List[Dict[str, Any]] = []
+    for temporada in _temporadas(base):
+        dir_temp = _dir_temporada(base, temporada)
+        rangos = _rangos_vigentes(dir_temp)
+        abierto = None
+        try:
+            for h, fecha, offset in _registros_inversos(dir_temp / archivo_idx, FMT_CLAVE):
+                if h != hash_clave:
+                    continue
+                # Fuera del rango vigente: versión reemplazada o archivado sin confirmar
+                rango = rangos.get(fecha)
+                if rango is None or not rango[0] <= offset < rango[1]:
+                    continue
+                if abierto is None:
+                    abierto = _abrir_datos(dir_temp)
+                    if abierto is None:
+                        break
+                registro, _ = _leer_frame(abierto[1], offset)
+                if coincide(registro):  # descarta colisiones de hash
+                    encontrados.append(registro)
+                    if len(encontrados) >= limite:
+                        return encontrados
+        finally:
+            if abierto is not None:
+                abierto[1].close()
+                abierto[0].close()
+    return encontrados
+
+
+def ultimos_partidos_equipo(equipo: str, limite: int = 10, base: Path = DIR_HISTORIAL) -> List[Dict[str, Any]]:
+    """Últimos `limite` partidos archivados de un equipo, del más reciente al más viejo."""
+    clave = _normalizar(equipo)
+    return _buscar_por_clave(
+        ARCHIVO_EQUIPOS,
+        _hash_clave(clave),
+        limite,
+        base,
+        lambda r: clave in (_normalizar(r["partido"].get("equipo1")), _normalizar(r["partido"].get("equipo2"))),
+    )
+
+
+def buscar_partido(href: str, base: Path = DIR_HISTORIAL) -> Optional[Dict[str, Any]]:
+    """Busca un partido archivado (con sus detalles) por su href de Promiedos."""
+    encontrados = _buscar_por_clave(
+        ARCHIVO_HREFS, _hash_clave(href), 1, base, lambda r: r["partido"].get("href") == href
+    )
+    return encontrados[0] if encontrados else None
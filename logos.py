@@ -0,0 +1,270 @@
+# ============================================================================
+# logos.py – Caché local de escudos + proxy de imágenes
+# ============================================================================
+# ➟ Los partidos*.json traen logo1/logo2 remotos de Promiedos; los mismos
+#   pocos cientos de escudos se repiten en miles de partidos.
+# ➟ Cada URL se descarga una sola vez, en segundo plano, y se guarda por hash
+#   de contenido (dos URLs con la misma imagen comparten archivo):
+#       logos/<hash>.<ext>          original
+#       logos/<hash>-<tam>.<ext>    variantes redimensionadas (TAMANIOS_LOGO)
+#       logos/urls/<sha256(url)>.json   URL remota → {url, hash, ext}
+#   Un archivo chico por URL: cada worker de gunicorn escribe solo los suyos,
+#   sin pisar lo que agregaron los demás.
+# ➟ Se sirven desde /logos/<archivo> con Cache-Control immutable + ETag.
+# ➟ Descargas simultáneas de la misma URL se unifican (single-flight).
+# ➟ Solo se descargan escudos de Promiedos (HOSTS_LOGOS), también al seguir
+#   redirecciones: el proxy no puede usarse para pedir URLs arbitrarias.
+# ----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+# ────────────────────────────── Configuración ───────────────────────────────
+
+DIR_LOGOS = Path("logos")
+DIR_REGISTRO_LOGOS = DIR_LOGOS / "urls"
+HOSTS_LOGOS = ("promiedos.com.ar",)  # y sus subdominios (www., api., …)
+TAMANIOS_LOGO = (32, 64, 128)
+TIMEOUT_DESCARGA = 10  # segundos
+MAX_DESCARGAS = 4  # descargas simultáneas en segundo plano
+MAX_BYTES_LOGO = 2 * 1024 * 1024
+CACHE_CONTROL_LOGOS = "public, max-age=31536000, immutable"
+
+EXTENSIONES = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "image/svg+xml": "svg",
+}
+RE_ARCHIVO_LOGO = re.compile(r"^[0-9a-f]{16}(-\d+)?\.(png|jpg|webp|gif|svg)$")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+
+# ────────────────────────────── Estado ──────────────────────────────────────
+
+_lock = threading.Lock()
+_registro: Dict[str, Dict[str, str]] = {}
+_en_curso: Dict[str, threading.Event] = {}
+_executor = ThreadPoolExecutor(max_workers=MAX_DESCARGAS, thread_name_prefix="logos")
+
+# ────────────────────────────── Registro ────────────────────────────────────
+
+def url_permitida(url: Optional[str]) -> bool:
+    """True si `url` es un escudo https de un host de Promiedos (sin puerto ni usuario)."""
+    if not url:
+        return False
+    try:
+        partes = urllib.parse.urlsplit(url)
+        puerto = partes.port
+    except ValueError:
+        return False
+    host = (partes.hostname or "").lower()
+    return (
+        partes.scheme == "https"
+        and puerto in (None, 443)
+        and not partes.username
+        and any(host == h or host.endswith("." + h) for h in HOSTS_LOGOS)
+    )
+
+
+def _escribir_atomico(destino: Path, contenido: bytes) -> None:
+    """Escribe vía un temporal único por proceso/hilo y lo renombra encima."""
+    tmp = destino.with_name(f".{destino.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(contenido)
+    tmp.replace(destino)
+
+
+def _archivo_registro(url: str) -> Path:
+    return DIR_REGISTRO_LOGOS / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _buscar_registro(url: str) -> Optional[Dict[str, str]]:
+    """
+    Entrada {hash, ext} de `url`: primero en memoria y, si no está, en su
+    archivo (puede haberlo escrito otro worker). Llamar con _lock tomado.
+    """
+    entrada = _registro.get(url)
+    if entrada is None:
+        try:
+            datos = json.loads(_archivo_registro(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if datos.get("url") != url:
+            return None
+        entrada = _registro[url] = {"hash": datos["hash"], "ext": datos["ext"]}
+    return entrada
+
+
+def _guardar_registro(url: str, entrada: Dict[str, str]) -> None:
+    """Guarda la entrada de `url` en su propio archivo. Llamar con _lock tomado."""
+    _registro[url] = entrada
+    DIR_REGISTRO_LOGOS.mkdir(parents=True, exist_ok=True)
+    datos = {"url": url, **entrada}
+    _escribir_atomico(_archivo_registro(url), json.dumps(datos, ensure_ascii=False).encode("utf-8"))
+
+
+def nombre_archivo(hash_logo: str, ext: str, tam: Optional[int] = None) -> str:
+    """
+    Archivo a servir: la variante de `tam` si existe en disco, si no el
+    original (los SVG, sin Pillow o si falló el redimensionado no hay variantes).
+    """
+    if tam in TAMANIOS_LOGO:
+        variante = f"{hash_logo}-{tam}.{ext}"
+        if (DIR_LOGOS / variante).exists():
+            return variante
+    return f"{hash_logo}.{ext}"
+
+
+def ruta_publica(hash_logo: str, ext: str, tam: Optional[int] = None) -> str:
+    return f"/logos/{nombre_archivo(hash_logo, ext, tam)}"
+
+
+def url_local(url: Optional[str], tam: Optional[int] = None) -> Optional[str]:
+    """
+    Devuelve la ruta local (/logos/...) de un logo remoto si ya está en caché.
+    Si todavía no se descargó, la encola en segundo plano y devuelve None.
+    """
+    if not url_permitida(url):
+        return None
+    with _lock:
+        entrada = _buscar_registro(url)
+    if entrada:
+        return ruta_publica(entrada["hash"], entrada["ext"], tam)
+    encolar(url)
+    return None
+
+# ────────────────────────────── Descarga ────────────────────────────────────
+
+def _extension(content_type: str, url: str) -> str:
+    ext = EXTENSIONES.get(content_type.split(";")[0].strip().lower())
+    if ext:
+        return ext
+    sufijo = url.rsplit("?", 1)[0].rsplit(".", 1)[-1].lower()
+    return {"jpeg": "jpg"}.get(sufijo, sufijo) if sufijo in ("png", "jpg", "jpeg", "webp", "gif", "svg") else "png"
+
+
+def _guardar_variantes(contenido: bytes, hash_logo: str, ext: str) -> None:
+    """Genera las variantes redimensionadas (requiere Pillow; si falta, se omite)."""
+    if ext == "svg":
+        return
+    try:
+        from PIL import Image
+    except ImportError:
+        return
+    try:
+        with Image.open(io.BytesIO(contenido)) as img:
+            formato = img.format or "PNG"
+            for tam in TAMANIOS_LOGO:
+                destino = DIR_LOGOS / f"{hash_logo}-{tam}.{ext}"
+                if destino.exists():
+                    continue
+                copia = img.copy()
+                copia.thumbnail((tam, tam))
+                buffer = io.BytesIO()
+                copia.save(buffer, format=formato)
+                _escribir_atomico(destino, buffer.getvalue())
+    except Exception:
+        pass
+
+
+class _RedireccionSegura(urllib.request.HTTPRedirectHandler):
+    """Sigue redirecciones solo hacia hosts permitidos."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if not url_permitida(newurl):
+            raise urllib.error.HTTPError(newurl, code, "Redirección a un host no permitido", headers, fp)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+_opener = urllib.request.build_opener(_RedireccionSegura())
+
+
+def _descargar(url: str) -> Optional[Dict[str, str]]:
+    if not url_permitida(url):
+        return None
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with _opener.open(req, timeout=TIMEOUT_DESCARGA) as resp:
+        contenido = resp.read(MAX_BYTES_LOGO + 1)
+        content_type = resp.headers.get("Content-Type", "")
+    if not contenido or len(contenido) > MAX_BYTES_LOGO:
+        return None
+
+    hash_logo = hashlib.sha256(contenido).hexdigest()[:16]
+    ext = _extension(content_type, url)
+    DIR_LOGOS.mkdir(parents=True, exist_ok=True)
+    original = DIR_LOGOS / f"{hash_logo}.{ext}"
+    if not original.exists():  # mismo contenido desde otra URL → ya está
+        _escribir_atomico(original, contenido)
+    _guardar_variantes(contenido, hash_logo, ext)
+    return {"hash": hash_logo, "ext": ext}
+
+
+def asegurar(url: str, timeout: Optional[float] = None) -> Optional[Dict[str, str]]:
+    """
+    Descarga el logo si hace falta y devuelve su entrada {hash, ext}.
+    Si otro hilo ya lo está descargando, espera a ese resultado en vez de
+    repetir la descarga. Devuelve None para URLs fuera de HOSTS_LOGOS.
+    """
+    if not url_permitida(url):
+        return None
+    with _lock:
+        entrada = _buscar_registro(url)
+        if entrada:
+            return entrada
+        evento = _en_curso.get(url)
+        soy_dueno = evento is None
+        if soy_dueno:
+            evento = _en_curso[url] = threading.Event()
+
+    if not soy_dueno:
+        evento.wait(timeout)
+        with _lock:
+            return _buscar_registro(url)
+
+    entrada = None
+    try:
+        entrada = _descargar(url)
+    except Exception:
+        entrada = None
+    finally:
+        with _lock:
+            if entrada:
+                _guardar_registro(url, entrada)
+            _en_curso.pop(url, None)
+        evento.set()
+    return entrada
+
+
+def encolar(url: str) -> None:
+    """Programa la descarga en segundo plano (sin duplicar las que ya corren)."""
+    if not url_permitida(url):
+        return
+    with _lock:
+        if url in _en_curso or _buscar_registro(url) is not None:
+            return
+    _executor.submit(asegurar, url)
+
+
+def anotar_partidos(ligas) -> None:
+    """Agrega logo1_local/logo2_local a los partidos cuyo escudo ya está en caché."""
+    for liga in ligas:
+        for partido in liga.get("partidos", []):
+            for campo in ("logo1", "logo2"):
+                partido[f"{campo}_local"] = url_local(partido.get(campo))
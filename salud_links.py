@@ -0,0 +1,207 @@
+# ============================================================================
+# salud_links.py – Verificador de links de streams (canales + eventos)
+# ============================================================================
+# ➟ scrapear_canales / scrapear_eventos publican todos los links que
+#   encuentran, incluso los caídos. Este módulo los prueba en segundo plano
+#   con un cliente HTTP asíncrono (aiohttp) con pool de conexiones y límite
+#   por host, y guarda el resultado en caché con TTL:
+#       salud_links.json   link → {alive, latency_ms, checked_at, expira}
+# ➟ Cada ciclo solo prueba los links nuevos o vencidos, así que el costo no
+#   crece con el tamaño de la lista de canales.
+# ➟ anotar_canales / anotar_eventos agregan alive, latency_ms y checked_at
+#   a los datos publicados.
+# ➟ El hilo corre en un solo proceso: iniciar() toma un lock de archivo
+#   (salud_links.lock) y los demás workers solo leen la caché que escribe él.
+# ----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import bloqueo
+
+# ────────────────────────────── Configuración ───────────────────────────────
+
+ARCHIVO_CACHE_SALUD = Path("salud_links.json")
+ARCHIVO_LIDER_SALUD = Path("salud_links.lock")
+INTERVALO_SALUD = 60  # segundos entre ciclos
+TTL_VIVO = 10 * 60  # segundos que vale un resultado OK
+TTL_CAIDO = 3 * 60  # los caídos se reintentan antes
+TIMEOUT_PRUEBA = 8  # segundos por link
+MAX_CONEXIONES = 50  # tamaño del pool
+MAX_POR_HOST = 4  # no saturar la14hd (casi todos los links van al mismo host)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+
+# ────────────────────────────── Estado ──────────────────────────────────────
+
+_lock = threading.Lock()
+_cache: Optional[Dict[str, Dict[str, Any]]] = None
+_mtime_cache: Optional[float] = None
+_hilo: Optional[threading.Thread] = None
+_lider: Optional[IO] = None  # archivo abierto que conserva el lock de líder
+
+
+def _cargar_cache() -> Dict[str, Dict[str, Any]]:
+    """
+    Devuelve la caché persistida, releyéndola si otro proceso (el líder) la
+    reescribió. Llamar con _lock tomado.
+    """
+    global _cache, _mtime_cache
+    try:
+        mtime = ARCHIVO_CACHE_SALUD.stat().st_mtime
+    except OSError:
+        mtime = None
+    if _cache is None or (mtime is not None and mtime != _mtime_cache):
+        try:
+            _cache = json.loads(ARCHIVO_CACHE_SALUD.read_text(encoding="utf-8"))
+        except Exception:
+            _cache = {} if _cache is None else _cache
+        _mtime_cache = mtime
+    return _cache
+
+
+def _guardar_cache() -> None:
+    """Escribe la caché de forma atómica. Llamar con _lock tomado."""
+    global _mtime_cache
+    tmp = ARCHIVO_CACHE_SALUD.with_name(f"{ARCHIVO_CACHE_SALUD.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(_cache, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(ARCHIVO_CACHE_SALUD)
+    _mtime_cache = ARCHIVO_CACHE_SALUD.stat().st_mtime
+
+
+def estado(link: str) -> Optional[Dict[str, Any]]:
+    """Último resultado conocido para un link (aunque esté vencido), o None."""
+    with _lock:
+        return _cargar_cache().get(link)
+
+
+def links_pendientes(links: Iterable[str], ahora: Optional[float] = None) -> List[str]:
+    """Links sin resultado en caché o con el resultado vencido."""
+    ahora = time.time() if ahora is None else ahora
+    with _lock:
+        cache = _cargar_cache()
+        return [l for l in dict.fromkeys(links) if l not in cache or cache[l]["expira"] <= ahora]
+
+# ────────────────────────────── Pruebas ─────────────────────────────────────
+
+async def _probar(sesion, link: str) -> Dict[str, Any]:
+    """GET del link; alcanza con el status y los primeros bytes."""
+    import aiohttp
+
+    t0 = time.perf_counter()
+    try:
+        async with sesion.get(link, allow_redirects=True) as resp:
+            await resp.content.read(1024)
+            vivo = resp.status < 400
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        vivo = False
+    latencia = round((time.perf_counter() - t0) * 1000)
+    ahora = time.time()
+    return {
+        "alive": vivo,
+        "latency_ms": latencia if vivo else None,
+        "checked_at": datetime.now().isoformat(timespec="seconds"),
+        "expira": ahora + (TTL_VIVO if vivo else TTL_CAIDO),
+    }
+
+
+async def _probar_todos(links: List[str]) -> Dict[str, Dict[str, Any]]:
+    import aiohttp
+
+    conector = aiohttp.TCPConnector(limit=MAX_CONEXIONES, limit_per_host=MAX_POR_HOST, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_PRUEBA)
+    async with aiohttp.ClientSession(
+        connector=conector, timeout=timeout, headers={"User-Agent": USER_AGENT}
+    ) as sesion:
+        resultados = await asyncio.gather(*(_probar(sesion, l) for l in links))
+    return dict(zip(links, resultados))
+
+
+def verificar(links: Iterable[str], vigentes: Optional[Iterable[str]] = None) -> int:
+    """
+    Prueba los links pendientes y actualiza la caché. Si se pasa `vigentes`,
+    se descartan de la caché los links que ya no se publican.
+    Devuelve la cantidad de links probados.
+    """
+    pendientes = links_pendientes(links)
+    resultados = asyncio.run(_probar_todos(pendientes)) if pendientes else {}
+    with _lock:
+        cache = _cargar_cache()
+        cache.update(resultados)
+        if vigentes is not None:
+            vigentes = set(vigentes)
+            for link in [l for l in cache if l not in vigentes]:
+                del cache[link]
+        _guardar_cache()
+    return len(pendientes)
+
+# ────────────────────────────── Anotación ───────────────────────────────────
+
+def _anotacion(link: str) -> Dict[str, Any]:
+    info = estado(link) or {}
+    return {
+        "alive": info.get("alive"),
+        "latency_ms": info.get("latency_ms"),
+        "checked_at": info.get("checked_at"),
+    }
+
+
+def anotar_canales(canales: List[Dict[str, Any]]) -> None:
+    """Agrega alive / latency_ms / checked_at a cada canal (None = sin verificar)."""
+    for canal in canales:
+        canal.update(_anotacion(canal.get("link", "")))
+
+
+def anotar_eventos(eventos: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Devuelve slug → {alive, latency_ms, checked_at}. Se publica aparte
+    («salud») para no cambiar el formato slug → link que usa el frontend.
+    """
+    return {slug_ev: _anotacion(link) for slug_ev, link in eventos.items()}
+
+# ────────────────────────────── Hilo ────────────────────────────────────────
+
+def iniciar(obtener_links: Callable[[], Tuple[List[str], bool]], al_terminar: Callable[[], None]) -> bool:
+    """
+    Arranca el hilo que cada INTERVALO_SALUD segundos verifica los links
+    publicados y llama a `al_terminar` para re-anotar los archivos.
+    `obtener_links` devuelve (links, completos): la caché solo se poda con
+    una lista completa, así un archivo ilegible no la vacía. Corre en
+    un solo proceso: si otro ya tiene el lock de líder no hace nada (se puede
+    volver a llamar: si el líder muere, el siguiente que llame toma su lugar).
+    Devuelve True si el hilo corre en este proceso.
+    """
+    global _hilo, _lider
+
+    def loop() -> None:
+        while True:
+            try:
+                links, completos = obtener_links()
+                if verificar(links, vigentes=links if completos and links else None):
+                    al_terminar()
+            except Exception as e:
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Error verificando links: {e}")
+            time.sleep(INTERVALO_SALUD)
+
+    with _lock:
+        if _hilo is not None:
+            return True
+        lider = bloqueo.tomar_liderazgo(ARCHIVO_LIDER_SALUD)
+        if lider is None:
+            return False
+        _lider = lider
+        _hilo = threading.Thread(target=loop, name="salud-links", daemon=True)
+        _hilo.start()
+    return True
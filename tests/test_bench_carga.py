@@ -0,0 +1,25 @@
+"""Los fixtures del benchmark de carga siguen a la app sin importarla."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import app
+import bench_carga
+
+
+def test_ligas_prueba_coinciden_con_la_app():
+    assert bench_carga.LIGAS_PRUEBA == app.PROMEDIOSINFO_LIGAS
+
+
+def test_fixtures_no_importan_app(tmp_path):
+    codigo = (
+        "import sys, bench_carga; from pathlib import Path; "
+        "bench_carga.escribir_fixtures(Path(sys.argv[1])); print('app' in sys.modules)"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo, str(tmp_path)],
+        cwd=Path(bench_carga.__file__).parent, capture_output=True, text=True, check=True,
+    ).stdout
+    assert salida.strip() == "False"
+    assert len(list(tmp_path.glob("*.json"))) == 9
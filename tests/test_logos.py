@@ -0,0 +1,52 @@
+"""Rutas de escudos locales y /logos/proxy (sin red)."""
+
+import pytest
+
+import app
+import logos
+
+URL_ESCUDO = "https://api.promiedos.com.ar/images/team/aaa/1"
+
+
+@pytest.fixture
+def dir_logos(tmp_path, monkeypatch):
+    monkeypatch.setattr(logos, "DIR_LOGOS", tmp_path)
+    (tmp_path / "0123456789abcdef.png").write_bytes(b"png")
+    (tmp_path / "0123456789abcdef-64.png").write_bytes(b"png")
+    (tmp_path / "fedcba9876543210.svg").write_bytes(b"<svg/>")
+    return tmp_path
+
+
+def test_ruta_publica_usa_la_variante_solo_si_existe(dir_logos):
+    assert logos.ruta_publica("0123456789abcdef", "png", 64) == "/logos/0123456789abcdef-64.png"
+    assert logos.ruta_publica("0123456789abcdef", "png", 32) == "/logos/0123456789abcdef.png"
+    assert logos.ruta_publica("0123456789abcdef", "png", 50) == "/logos/0123456789abcdef.png"
+    assert logos.ruta_publica("fedcba9876543210", "svg", 64) == "/logos/fedcba9876543210.svg"
+
+
+@pytest.mark.parametrize("url", [
+    "http://169.254.169.254/latest/meta-data/",
+    "https://evil.example/escudo.png",
+    "http://www.promiedos.com.ar/escudo.png",
+    "https://www.promiedos.com.ar:8443/escudo.png",
+    "https://promiedos.com.ar.evil.example/escudo.png",
+])
+def test_proxy_rechaza_hosts_no_permitidos(url, monkeypatch):
+    monkeypatch.setattr(logos, "asegurar", lambda *a, **k: pytest.fail("no debería descargar"))
+    resp = app.app.test_client().get("/logos/proxy", query_string={"url": url})
+    assert resp.status_code == 400
+    assert "Location" not in resp.headers
+
+
+@pytest.mark.parametrize("hash_logo, ext, tam, esperado, codigo", [
+    ("0123456789abcdef", "png", 64, "/logos/0123456789abcdef-64.png", 301),
+    ("0123456789abcdef", "png", 32, "/logos/0123456789abcdef.png", 302),
+    ("fedcba9876543210", "svg", 128, "/logos/fedcba9876543210.svg", 302),
+    ("0123456789abcdef", "png", None, "/logos/0123456789abcdef.png", 301),
+])
+def test_proxy_redirige_permanente_solo_a_archivos_existentes(dir_logos, monkeypatch, hash_logo, ext, tam, esperado, codigo):
+    monkeypatch.setattr(logos, "asegurar", lambda *a, **k: {"hash": hash_logo, "ext": ext})
+    consulta = {"url": URL_ESCUDO, **({"size": tam} if tam else {})}
+    resp = app.app.test_client().get("/logos/proxy", query_string=consulta)
+    assert resp.status_code == codigo
+    assert resp.headers["Location"].endswith(esperado)
@@ -0,0 +1,59 @@
+"""Caché de salud de links: la poda no vacía la caché con listas incompletas."""
+
+import json
+import time
+
+import pytest
+
+import app
+import salud_links
+
+# _FinCiclo termina el hilo del verificador a propósito
+pytestmark = pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+
+
+class _FinCiclo(BaseException):
+    """Corta el loop del hilo después del primer ciclo."""
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(salud_links, "_cache", None)
+    monkeypatch.setattr(salud_links, "_mtime_cache", None)
+    monkeypatch.setattr(salud_links, "_hilo", None)
+    monkeypatch.setattr(salud_links, "_lider", None)
+    vigente = {"alive": True, "latency_ms": 10, "checked_at": "2025-06-14T20:00:00", "expira": time.time() + 600}
+    datos = {"https://la14hd.com/a": vigente, "https://la14hd.com/b": vigente}
+    salud_links.ARCHIVO_CACHE_SALUD.write_text(json.dumps(datos), encoding="utf-8")
+    return datos
+
+
+def correr_un_ciclo(monkeypatch, obtener_links):
+    def sleep(_segundos):
+        raise _FinCiclo
+
+    monkeypatch.setattr(salud_links.time, "sleep", sleep)
+    assert salud_links.iniciar(obtener_links, lambda: None)
+    salud_links._hilo.join(5)
+    assert not salud_links._hilo.is_alive()
+    salud_links._lider.close()
+
+
+def test_links_streams_avisa_si_falta_un_archivo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app.SALIDA_CANALES.write_text(json.dumps({"canales": [{"link": "https://la14hd.com/a"}]}), encoding="utf-8")
+    assert app.links_streams() == (["https://la14hd.com/a"], False)
+    app.SALIDA_EVENTOS.write_text(json.dumps({"eventos": {"x": "https://la14hd.com/b"}}), encoding="utf-8")
+    assert app.links_streams() == (["https://la14hd.com/a", "https://la14hd.com/b"], True)
+
+
+@pytest.mark.parametrize("resultado", [([], False), ([], True), (["https://la14hd.com/a"], False)])
+def test_lista_vacia_o_incompleta_no_poda(cache, monkeypatch, resultado):
+    correr_un_ciclo(monkeypatch, lambda: resultado)
+    assert set(json.loads(salud_links.ARCHIVO_CACHE_SALUD.read_text(encoding="utf-8"))) == set(cache)
+
+
+def test_lista_completa_poda_lo_que_ya_no_se_publica(cache, monkeypatch):
+    correr_un_ciclo(monkeypatch, lambda: (["https://la14hd.com/a"], True))
+    assert set(json.loads(salud_links.ARCHIVO_CACHE_SALUD.read_text(encoding="utf-8"))) == {"https://la14hd.com/a"}
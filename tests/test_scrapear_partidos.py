@@ -0,0 +1,96 @@
+"""scrapear_partidos con un driver falso: sin navegador ni red."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import app
+import logos
+
+
+class NodoFalso:
+    """Elemento mínimo: clase, texto, atributos y sub-elementos por selector."""
+
+    def __init__(self, clase="", texto="", attrs=None, hijos=None):
+        self.text = texto
+        self._attrs = {"class": clase, **(attrs or {})}
+        self._hijos = hijos or {}
+
+    def get_attribute(self, nombre):
+        return self._attrs.get(nombre)
+
+    def find_elements(self, _by, selector):
+        return self._hijos.get(selector, [])
+
+    def find_element(self, by, selector):
+        encontrados = self.find_elements(by, selector)
+        if not encontrados:
+            raise LookupError(selector)
+        return encontrados[0]
+
+
+class DriverFalso:
+    def __init__(self, nodos):
+        self._main = NodoFalso(hijos={"*": nodos})
+        self.cerrado = False
+
+    def get(self, _url):
+        pass
+
+    def find_element(self, _by, _selector):
+        return self._main
+
+    def quit(self):
+        self.cerrado = True
+
+
+def partido(equipo1, equipo2, logo1, logo2, goles=("1", "0")):
+    return NodoFalso(
+        clase=f"{app.CLS_PARTIDO}_x",
+        attrs={"href": "https://www.promiedos.com.ar/game/abc"},
+        hijos={
+            f"span[class*='{app.CLS_EQUIPO}']": [NodoFalso(texto=equipo1), NodoFalso(texto=equipo2)],
+            f"div.{app.CLS_LOGO} img.team": [NodoFalso(attrs={"src": logo1}), NodoFalso(attrs={"src": logo2})],
+            f"span[class*='{app.CLS_SCORE}']": [NodoFalso(texto=goles[0]), NodoFalso(texto=goles[1])],
+            f"div[class*='{app.CLS_MINUTO}']": [NodoFalso(texto="Final")],
+        },
+    )
+
+
+@pytest.fixture
+def scrapear(tmp_path, monkeypatch):
+    """Corre scrapear_partidos("", …) sobre `nodos` y devuelve el JSON escrito."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app, "By", SimpleNamespace(TAG_NAME="tag name", CSS_SELECTOR="css selector"))
+    monkeypatch.setattr(app, "esperar_pagina", lambda driver, tipo: "listo")
+    monkeypatch.setattr(logos, "encolar", lambda url: None)  # sin descargas
+
+    def correr(nodos):
+        driver = DriverFalso(nodos)
+        monkeypatch.setattr(app, "crear_driver", lambda: driver)
+        salida = tmp_path / "partidos.json"
+        app.scrapear_partidos("", salida)
+        assert driver.cerrado
+        return json.loads(salida.read_text(encoding="utf-8"))
+
+    return correr
+
+
+def test_escribe_partidos_con_logos(scrapear):
+    logo1 = "https://api.promiedos.com.ar/images/team/aaa/1"
+    logo2 = "https://api.promiedos.com.ar/images/team/bbb/1"
+    datos = scrapear([
+        NodoFalso(clase=f"{app.CLS_ENCAB_LIGA}_x", texto="Liga Profesional"),
+        partido("Boca", "River", logo1, logo2),
+    ])
+
+    assert [l["liga"] for l in datos["ligas"]] == ["Liga Profesional"]
+    p = datos["ligas"][0]["partidos"][0]
+    assert (p["equipo1"], p["equipo2"], p["goles1"], p["goles2"]) == ("Boca", "River", "1", "0")
+    assert (p["logo1"], p["logo2"], p["href"]) == (logo1, logo2, "/game/abc")
+    assert p["logo1_local"] is None and p["logo2_local"] is None  # todavía no descargados
+
+
+def test_pagina_sin_partidos(scrapear):
+    assert scrapear([])["ligas"] == []
@@ -0,0 +1,32 @@
+"""/status mientras otros hilos escriben métricas y snapshots."""
+
+import threading
+
+import app
+
+
+def test_status_con_escrituras_concurrentes(monkeypatch):
+    monkeypatch.setattr(app, "_SNAPSHOTS", {})
+    parar = threading.Event()
+
+    def escritor():
+        k = 0
+        while not parar.is_set():
+            app.TIEMPOS_LISTO["partidos"].append((float(k % 500), "listo"))
+            app._SNAPSHOTS[f"snap{k % 300}.json"] = (-1, None, b"{}")
+            if k % 300 == 299:
+                app._SNAPSHOTS.clear()
+            k += 1
+
+    hilos = [threading.Thread(target=escritor) for _ in range(2)]
+    for h in hilos:
+        h.start()
+    try:
+        cliente = app.app.test_client()
+        for _ in range(300):
+            assert cliente.get("/status").status_code == 200
+    finally:
+        parar.set()
+        for h in hilos:
+            h.join()
+        app.TIEMPOS_LISTO["partidos"].clear()